@@ -8,7 +8,8 @@ from typing import Any, Literal
 
 from prometheus_client import Counter, Gauge
 
-from pgbackrest_exporter.models import PgBackRestInfo
+from pgbackrest_exporter.history import BackupHistory, prune_history, update_history
+from pgbackrest_exporter.models import Backup, PgBackRestInfo
 
 logger: Logger = getLogger(name=__name__)
 
@@ -84,6 +85,69 @@ PGBACKREST_BACKUP_SIZE = Gauge(
     labelnames=("command", "stanza", "database", "repo", "backup_type", "compressed"),
 )
 
+PGBACKREST_HISTORY_BACKUPS = Gauge(
+    namespace="pgbackrest",
+    subsystem="history",
+    name="backups",
+    documentation="Count of backups kept in history",
+    labelnames=("command", "stanza", "repo"),
+)
+
+PGBACKREST_HISTORY_GROWTH = Gauge(
+    namespace="pgbackrest",
+    subsystem="history",
+    name="growth_bytes_per_day",
+    documentation="Backup size growth rate over history",
+    labelnames=("command", "stanza", "repo", "compressed"),
+)
+
+PGBACKREST_HISTORY_FULL_INTERVAL = Gauge(
+    namespace="pgbackrest",
+    subsystem="history",
+    name="full_interval_seconds",
+    documentation="Mean interval between full backups in seconds",
+    labelnames=("command", "stanza", "repo"),
+)
+
+PGBACKREST_HISTORY_CHAIN_SIZE = Gauge(
+    namespace="pgbackrest",
+    subsystem="history",
+    name="chain_size",
+    documentation="Summary delta of backups since last full backup",
+    labelnames=("command", "stanza", "repo", "compressed"),
+)
+
+
+def update_history_metrics(target: str, stanza: str, backups: list[Backup]) -> None:
+    """Update stanza's backup history and metrics derived from it."""
+
+    histories: dict[int, BackupHistory] = update_history(
+        target=target, stanza=stanza, backups=backups
+    )
+    for repo_key, history in histories.items():
+        labelvalues: tuple[str, str, int] = target, stanza, repo_key
+        PGBACKREST_HISTORY_BACKUPS.labels(*labelvalues).set(value=len(history))
+        PGBACKREST_HISTORY_FULL_INTERVAL.labels(*labelvalues).set(value=history.full_interval())
+
+        for compressed in ("no", "yes"):
+            PGBACKREST_HISTORY_GROWTH.labels(*labelvalues, compressed).set(
+                value=history.growth(compressed=compressed)
+            )
+            PGBACKREST_HISTORY_CHAIN_SIZE.labels(*labelvalues, compressed).set(
+                value=history.chain_size(compressed=compressed)
+            )
+
+
+def prune_history_metrics(target: str, stanzas: list[str]) -> None:
+    """Drop histories and metrics of target's stanzas missing from output."""
+
+    for labelvalues in prune_history(target=target, stanzas=stanzas):
+        PGBACKREST_HISTORY_BACKUPS.remove(*labelvalues)
+        PGBACKREST_HISTORY_FULL_INTERVAL.remove(*labelvalues)
+        for compressed in ("no", "yes"):
+            PGBACKREST_HISTORY_GROWTH.remove(*labelvalues, compressed)
+            PGBACKREST_HISTORY_CHAIN_SIZE.remove(*labelvalues, compressed)
+
 
 async def update_target(target: str, command: str) -> tuple[str, int]:
     """Execute single command and update metrics."""
@@ -152,6 +216,12 @@ async def update_target(target: str, command: str) -> tuple[str, int]:
                     value=backup.info.repository.size
                 )
 
+            # Update history metrics
+            update_history_metrics(target=target, stanza=parsed.name, backups=parsed.backup)
+
+        # Drop histories and history metrics of stanzas missing from output
+        prune_history_metrics(target=target, stanzas=[result["name"] for result in output])
+
     # Count all exceptions and don't let collector to fail
     except Exception as exc:  # pylint: disable=broad-exception-caught
         EXCEPTIONS_METRIC.labels(target).inc()
@@ -0,0 +1,222 @@
+"""Compact per-repository backup history and metrics derived from it."""
+
+from array import array
+from typing import Iterable, Literal
+
+from pgbackrest_exporter.models import Backup
+
+# Upper bound of backups kept per history, oldest ones are dropped first
+MAX_BACKUPS = 1024
+
+_SECONDS_PER_DAY = 86400
+_TYPE_CODES: dict[str, int] = {"full": 0, "diff": 1, "incr": 2}
+
+
+class BackupHistory:  # pylint: disable=too-many-instance-attributes
+    """
+    Array-backed history of backups of single (target, stanza, repo).
+
+    Backups are appended incrementally in chronological order: only backups
+    newer than the latest known one are appended, labels missing from the
+    latest output are treated as expired and evicted. Incremental chain size
+    of each backup is computed once on insertion from its `prior` backup, so
+    derived metrics don't require walking the whole history on every
+    collection.
+    """
+
+    def __init__(self, max_backups: int = MAX_BACKUPS) -> None:
+        self.max_backups: int = max_backups
+
+        self.labels: list[str] = []
+        self.types: array = array("b")
+        self.start: array = array("q")
+        self.stop: array = array("q")
+        self.size: array = array("q")
+        self.repo_size: array = array("q")
+        self.chain: array = array("q")
+        self.repo_chain: array = array("q")
+
+        # Labels are indexed by sequence number, position is sequence minus offset
+        self._index: dict[str, int] = {}
+        self._offset: int = 0
+        self._full_count: int = 0
+        self._first_full: int = -1
+        self._last_full: int = -1
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def _columns(self) -> tuple[array, ...]:
+        return (
+            self.types,
+            self.start,
+            self.stop,
+            self.size,
+            self.repo_size,
+            self.chain,
+            self.repo_chain,
+        )
+
+    def update(self, backups: Iterable[Backup]) -> None:
+        """Append new backups and evict expired ones."""
+
+        seen: set[str] = set()
+        for backup in backups:
+            seen.add(backup.label)
+            if backup.label in self._index:
+                continue
+
+            # Backups older than the latest known one were already trimmed
+            if self.labels and backup.timestamp.start <= self.start[-1]:
+                continue
+
+            self._append(backup=backup)
+
+        expired: list[int] = [pos for pos, label in enumerate(self.labels) if label not in seen]
+        if expired == list(range(len(expired))):
+            self._trim(count=len(expired))
+        else:
+            self._evict(positions=expired)
+
+        if len(self.labels) > self.max_backups:
+            self._trim(count=len(self.labels) - self.max_backups)
+
+    def _append(self, backup: Backup) -> None:
+        """Append single backup, chaining its sizes to prior backup."""
+
+        # Full backup starts new chain, so its own size is not counted
+        chain: int = 0
+        repo_chain: int = 0
+        if backup.type != "full":
+            chain, repo_chain = backup.info.delta, backup.info.repository.delta
+            if backup.prior in self._index:
+                prior: int = self._index[backup.prior] - self._offset
+                chain += self.chain[prior]
+                repo_chain += self.repo_chain[prior]
+
+        sequence: int = self._offset + len(self.labels)
+        self._index[backup.label] = sequence
+        self.labels.append(backup.label)
+        self.types.append(_TYPE_CODES[backup.type])
+        self.start.append(backup.timestamp.start)
+        self.stop.append(backup.timestamp.stop)
+        self.size.append(backup.info.size)
+        self.repo_size.append(backup.info.repository.size)
+        self.chain.append(chain)
+        self.repo_chain.append(repo_chain)
+
+        if backup.type == "full":
+            self._full_count += 1
+            self._last_full = sequence
+            if self._first_full < 0:
+                self._first_full = sequence
+
+    def _trim(self, count: int) -> None:
+        """Drop given count of oldest backups."""
+
+        if count <= 0:
+            return
+
+        full_code: int = _TYPE_CODES["full"]
+        self._full_count -= sum(1 for code in self.types[:count] if code == full_code)
+        for label in self.labels[:count]:
+            del self._index[label]
+
+        del self.labels[:count]
+        for column in self._columns():
+            del column[:count]
+
+        self._offset += count
+        if self._first_full < self._offset:
+            first: int = next((pos for pos, code in enumerate(self.types) if code == full_code), -1)
+            self._first_full = first + self._offset if first >= 0 else -1
+            if first < 0:
+                self._last_full = -1
+
+    def _evict(self, positions: Iterable[int]) -> None:
+        """Drop backups at given positions and rebuild lookup state."""
+
+        drop: set[int] = set(positions)
+        keep: list[int] = [pos for pos in range(len(self.labels)) if pos not in drop]
+
+        self.labels = [self.labels[pos] for pos in keep]
+        for column in self._columns():
+            column[:] = array(column.typecode, (column[pos] for pos in keep))
+
+        self._offset = 0
+        self._index = {label: pos for pos, label in enumerate(self.labels)}
+        full_code: int = _TYPE_CODES["full"]
+        fulls: list[int] = [pos for pos, code in enumerate(self.types) if code == full_code]
+        self._full_count = len(fulls)
+        self._first_full = fulls[0] if fulls else -1
+        self._last_full = fulls[-1] if fulls else -1
+
+    def growth(self, compressed: Literal["no", "yes"]) -> float:
+        """Size growth in bytes per day between oldest and newest backups."""
+
+        if len(self.labels) < 2:
+            return 0.0
+
+        elapsed: int = self.stop[-1] - self.stop[0]
+        if elapsed <= 0:
+            return 0.0
+
+        sizes: array = self.repo_size if compressed == "yes" else self.size
+        return (sizes[-1] - sizes[0]) * _SECONDS_PER_DAY / elapsed
+
+    def full_interval(self) -> float:
+        """Mean interval in seconds between full backups."""
+
+        if self._full_count < 2:
+            return 0.0
+
+        first: int = self._first_full - self._offset
+        last: int = self._last_full - self._offset
+        elapsed: int = self.start[last] - self.start[first]
+        return elapsed / (self._full_count - 1)
+
+    def chain_size(self, compressed: Literal["no", "yes"]) -> int:
+        """Summary delta of latest backup's chain since last full backup."""
+
+        if not self.labels:
+            return 0
+
+        chain: array = self.repo_chain if compressed == "yes" else self.chain
+        return chain[-1]
+
+
+HISTORY: dict[tuple[str, str, int], BackupHistory] = {}
+
+
+def update_history(target: str, stanza: str, backups: list[Backup]) -> dict[int, BackupHistory]:
+    """Update histories of each stanza's repository and return them by repository key."""
+
+    # Known repositories without backups in output have all their backups expired
+    by_repo: dict[int, list[Backup]] = {
+        repo_key: [] for (hist_target, hist_stanza, repo_key) in HISTORY
+        if (hist_target, hist_stanza) == (target, stanza)
+    }
+    for backup in backups:
+        by_repo.setdefault(backup.database.repo_key, []).append(backup)
+
+    histories: dict[int, BackupHistory] = {}
+    for repo_key, repo_backups in by_repo.items():
+        history: BackupHistory = HISTORY.setdefault((target, stanza, repo_key), BackupHistory())
+        history.update(backups=repo_backups)
+        histories[repo_key] = history
+
+    return histories
+
+
+def prune_history(target: str, stanzas: Iterable[str]) -> list[tuple[str, str, int]]:
+    """Drop histories of target's stanzas missing from output and return their keys."""
+
+    keep: set[str] = set(stanzas)
+    pruned: list[tuple[str, str, int]] = [
+        key for key in HISTORY if key[0] == target and key[1] not in keep
+    ]
+
+    for key in pruned:
+        del HISTORY[key]
+
+    return pruned
@@ -65,6 +65,10 @@ async def test_pgbackrest_metrics(tmp_path: Path, aiohttp_client: TestClient) ->
         "pgbackrest_backup_duration",
         "pgbackrest_backup_delta",
         "pgbackrest_backup_size",
+        "pgbackrest_history_backups",
+        "pgbackrest_history_growth_bytes_per_day",
+        "pgbackrest_history_full_interval_seconds",
+        "pgbackrest_history_chain_size",
     )
     test_metrics: dict[str, bool] = {name: False for name in test_metrics_names}
 
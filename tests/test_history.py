@@ -0,0 +1,98 @@
+"""Tests for backup history."""
+
+from pgbackrest_exporter.history import HISTORY, BackupHistory, prune_history, update_history
+from pgbackrest_exporter.models import Backup
+
+DAY = 86400
+
+
+def make_backup(label: str, backup_type: str, prior: str | None, start: int, size: int, delta: int) -> Backup:
+    """Build backup model with given label, chain and sizes."""
+
+    return Backup(
+        **{
+            "archive": {"start": "000000010000000000000005", "stop": "000000010000000000000005"},
+            "backrest": {"format": 5, "version": "2.43"},
+            "database": {"id": 1, "repo-key": 1},
+            "error": False,
+            "info": {"delta": delta, "repository": {"delta": delta // 2, "size": size // 2}, "size": size},
+            "label": label,
+            "lsn": {"start": "0/5000028", "stop": "0/5000138"},
+            "prior": prior,
+            "reference": [prior] if prior else None,
+            "timestamp": {"start": start, "stop": start + 10},
+            "type": backup_type,
+        }
+    )
+
+
+FULL_1 = make_backup(label="F1", backup_type="full", prior=None, start=0, size=1000, delta=1000)
+DIFF_1 = make_backup(label="F1_D1", backup_type="diff", prior="F1", start=DAY, size=1100, delta=100)
+INCR_1 = make_backup(label="F1_I1", backup_type="incr", prior="F1_D1", start=2 * DAY, size=1200, delta=40)
+FULL_2 = make_backup(label="F2", backup_type="full", prior=None, start=4 * DAY, size=1400, delta=1400)
+INCR_2 = make_backup(label="F2_I1", backup_type="incr", prior="F2", start=5 * DAY, size=1500, delta=60)
+
+
+def test_chain_size() -> None:
+    """Test incremental chain size follows prior backups since last full."""
+
+    history = BackupHistory()
+    history.update(backups=[FULL_1, DIFF_1, INCR_1])
+
+    assert history.chain_size(compressed="no") == 140
+    assert history.chain_size(compressed="yes") == 70
+
+    history.update(backups=[FULL_1, DIFF_1, INCR_1, FULL_2])
+    assert history.chain_size(compressed="no") == 0
+
+
+def test_growth_and_full_interval() -> None:
+    """Test derived growth rate and full backups interval."""
+
+    history = BackupHistory()
+    history.update(backups=[FULL_1, DIFF_1, INCR_1, FULL_2, INCR_2])
+
+    assert len(history) == 5
+    assert history.growth(compressed="no") == 100
+    assert history.growth(compressed="yes") == 50
+    assert history.full_interval() == 4 * DAY
+
+
+def test_expired_eviction() -> None:
+    """Test backups missing from output are evicted."""
+
+    history = BackupHistory()
+    history.update(backups=[FULL_1, DIFF_1, INCR_1, FULL_2])
+    history.update(backups=[FULL_2, INCR_2])
+
+    assert history.labels == ["F2", "F2_I1"]
+    assert history.full_interval() == 0
+    assert history.chain_size(compressed="no") == 60
+
+
+def test_max_backups() -> None:
+    """Test history is bounded by maximum count of backups."""
+
+    history = BackupHistory(max_backups=2)
+    for _ in range(3):
+        history.update(backups=[FULL_1, DIFF_1, INCR_1])
+
+        assert history.labels == ["F1_D1", "F1_I1"]
+        assert history.chain_size(compressed="no") == 140
+        assert history.growth(compressed="no") == 100
+
+    history.update(backups=[FULL_1, DIFF_1, INCR_1, FULL_2, INCR_2])
+    assert history.labels == ["F2", "F2_I1"]
+    assert history.chain_size(compressed="no") == 60
+
+
+def test_prune_history() -> None:
+    """Test histories of stanzas missing from output are dropped."""
+
+    HISTORY.clear()
+    update_history(target="test", stanza="foo", backups=[FULL_1])
+    update_history(target="test", stanza="bar", backups=[FULL_1])
+    update_history(target="other", stanza="foo", backups=[FULL_1])
+
+    assert prune_history(target="test", stanzas=["bar"]) == [("test", "foo", 1)]
+    assert set(HISTORY) == {("test", "bar", 1), ("other", "foo", 1)}